@@ -0,0 +1,120 @@
+"""Benchmark patient search latency as the patients collection grows.
+
+Seeds a scratch collection (BENCH_COLLECTION, default 'patients_search_bench') in
+DATABASE_NAME with synthetic patients, then times representative search queries
+at each size. The scratch collection is dropped at the start and the end.
+
+Queries run with the endpoint's default sort (the filtered field) unless a
+sort is given; the "by id" rows force sort_by=patientid on a range filter to
+show the cost of a sort that the index cannot serve.
+
+Usage: python -m benchmarks.bench_patient_search [size ...]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from pymongo import MongoClient
+from utils.patient_search import ensure_patient_indexes, build_search_filter, search_patients
+
+load_dotenv()
+
+MONGODB_CONNECTION_STRING = os.getenv("MONGODB_CONNECTION_STRING")
+DATABASE_NAME = os.getenv("DATABASE_NAME")
+BENCH_COLLECTION = os.getenv("BENCH_COLLECTION", "patients_search_bench")
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+BATCH_SIZE = 10_000
+RUNS_PER_QUERY = 50
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Kavya", "Rohan", "Sneha", "Vikram", "Ananya", "Arjun", "Meera"]
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Nair", "Patel", "Gupta", "Rao", "Menon", "Das", "Singh"]
+PLAN_TYPES = ["Diet", "Exercise", "Routine"]
+
+
+def make_patient(patientid, now):
+    name = f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)} {patientid}"
+    patient = {
+        "patientid": patientid,
+        "name": name,
+        "name_lower": name.lower(),
+        "mobileno": f"91{9000000000 + patientid}",
+        "email": f"patient{patientid}@example.com",
+        "type": random.choice(PLAN_TYPES),
+    }
+    # Roughly a third of patients have a meeting within +/- 30 days
+    if patientid % 3 == 0:
+        meeting_dt = now + timedelta(minutes=random.randint(-30 * 24 * 60, 30 * 24 * 60))
+        patient["meeting_details"] = {
+            "meeting_link": "https://meet.google.com/abc-defg-hij",
+            "meeting_datetime": meeting_dt.replace(microsecond=0).isoformat(),
+            "scheduled_at": now.isoformat(),
+            "email_sent": True
+        }
+    return patient
+
+
+def grow_collection(collection, start, end, now):
+    for batch_start in range(start, end, BATCH_SIZE):
+        batch_end = min(batch_start + BATCH_SIZE, end)
+        collection.insert_many(
+            [make_patient(pid, now) for pid in range(batch_start, batch_end)],
+            ordered=False
+        )
+
+
+def time_query(collection, **search_kwargs):
+    filters = search_kwargs.pop("filters", {})
+    timings = []
+    for _ in range(RUNS_PER_QUERY):
+        query = build_search_filter(**filters)
+        started = time.perf_counter()
+        records, next_cursor = search_patients(collection, query, **search_kwargs)
+        # Follow one cursor hop so pagination cost is included
+        if next_cursor:
+            search_patients(collection, query, cursor=next_cursor, **search_kwargs)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[-1]
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    client = MongoClient(MONGODB_CONNECTION_STRING)
+    collection = client[DATABASE_NAME][BENCH_COLLECTION]
+    collection.drop()
+    ensure_patient_indexes(collection)
+
+    now = datetime.now()
+    upcoming = {
+        "meeting_from": now.replace(microsecond=0).isoformat(),
+        "meeting_to": (now + timedelta(days=7)).replace(microsecond=0).isoformat()
+    }
+    queries = {
+        "name prefix": {"filters": {"name": "kavya"}},
+        "name prefix by id": {"filters": {"name": "kavya"}, "sort_by": "patientid"},
+        "mobileno exact": {"filters": {"mobileno": f"91{9000000000 + 4242}"}},
+        "type exact": {"filters": {"type": "Diet"}},
+        "type + name sort": {"filters": {"type": "Diet"}, "sort_by": "name"},
+        "upcoming 7 days": {"filters": upcoming},
+        "upcoming by id": {"filters": upcoming, "sort_by": "patientid"},
+        "type + upcoming": {"filters": {"type": "Diet", **upcoming}},
+    }
+
+    try:
+        loaded = 0
+        print(f"{'patients':>10}  {'query':<18}  {'p50 ms':>8}  {'p95 ms':>8}")
+        for size in sorted(sizes):
+            grow_collection(collection, loaded, size, now)
+            loaded = size
+            for label, kwargs in queries.items():
+                p50, p95 = time_query(collection, limit=50, **dict(kwargs))
+                print(f"{size:>10}  {label:<18}  {p50:>8.2f}  {p95:>8.2f}")
+    finally:
+        collection.drop()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,10 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
+from pydantic import BaseModel
+from typing import List
 from datetime import datetime, timedelta
 from functions.send_whatsapp_msg import send_greeting_message, send_template_message, send_whatsapp_message
 from templates.ada_templates import get_template_name
@@ -11,7 +14,11 @@ import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from utils.google_calendar import create_google_meet_event
+from utils.google_calendar import (
+    get_calendar_service, build_meet_event, create_google_meet_event,
+    create_google_meet_events_batch, delete_google_meet_events_batch
+)
+from utils.patient_search import SORT_FIELDS, normalize_meeting_bound, build_search_filter, search_patients
 
 
 app = FastAPI()
@@ -42,6 +49,7 @@ client = MongoClient(MONGODB_CONNECTION_STRING)
 db = client[DATABASE_NAME]
 collection = db[COLLECTION_NAME]
 meeting_history_collection = db[HISTORY_COLLECTION]
+# Search indexes are created by scripts/migrate_patient_search.py, not at startup
 
 
 def send_meeting_email(patient_name, patient_email, meeting_datetime, meet_link):
@@ -117,6 +125,18 @@ If you need immediate assistance, contact our support team.
         print(f"❌ Failed to send email: {str(e)}")
         return False
 
+def serialize_patient_record(record):
+    """Convert datetime fields of a patient record to ISO strings for JSON responses"""
+    if 'time' in record and hasattr(record['time'], 'isoformat'):
+        record['time'] = record['time'].isoformat()
+    if 'meeting_details' in record and isinstance(record['meeting_details'], dict):
+        if 'scheduled_at' in record['meeting_details']:
+            # Handle both string and datetime objects
+            scheduled_at = record['meeting_details']['scheduled_at']
+            if hasattr(scheduled_at, 'isoformat'):
+                record['meeting_details']['scheduled_at'] = scheduled_at.isoformat()
+    return record
+
 @app.post('/api/schedule_meeting')
 async def schedule_meeting(patientid: int, meeting_datetime: str):
     """Schedule a meeting and send email to patient"""
@@ -201,6 +221,241 @@ async def schedule_meeting(patientid: int, meeting_datetime: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to schedule meeting: {str(e)}")
 
+# Upper bound on meetings per bulk request, roughly a full clinic day
+MAX_BULK_MEETINGS = 200
+
+
+class MeetingRequest(BaseModel):
+    patientid: int
+    meeting_datetime: str
+
+
+def send_queued_meeting_email(patientid, patient_name, patient_email, meeting_datetime, meet_link):
+    """Send a bulk-scheduled meeting email and record delivery on the stored meeting"""
+    if not send_meeting_email(patient_name, patient_email, meeting_datetime, meet_link):
+        return
+    meeting_history_collection.update_one(
+        {"patient_id": patientid, "meeting_details.meeting_link": meet_link},
+        {"$set": {"meeting_details.$.email_sent": True}}
+    )
+    collection.update_one(
+        {"patientid": patientid, "meeting_details.meeting_link": meet_link},
+        {"$set": {"meeting_details.email_sent": True}}
+    )
+
+
+def bulk_write_meetings(target, ops, writes, results):
+    """Run an unordered bulk_write and return the writes that were persisted
+
+    `writes` lines up with `ops` and starts each entry with the item's index in
+    results. Failed operations are mapped back to their item and marked there.
+    """
+    if not ops:
+        return []
+    try:
+        target.bulk_write(ops, ordered=False)
+        return writes
+    except BulkWriteError as e:
+        failed = {}
+        for write_error in e.details.get('writeErrors', []):
+            failed[write_error['index']] = write_error.get('errmsg', 'Write failed')
+        for position, write in enumerate(writes):
+            if position in failed:
+                results[write[0]]["error"] = f"Failed to store meeting: {failed[position]}"
+        return [write for position, write in enumerate(writes) if position not in failed]
+
+
+def discard_unstored_meetings(service, unstored, results):
+    """Undo meetings whose Calendar event exists but which could not be stored
+
+    `unstored` holds (index, patientid, meet_link, event_id) tuples. History
+    pushes are pulled back and the Calendar events deleted; items whose event
+    could not be deleted are reported as created_unstored.
+    """
+    rollbacks = [(index, patientid, meet_link) for index, patientid, meet_link, _ in unstored if meet_link]
+    if rollbacks:
+        try:
+            # Pulling a meeting that was never pushed is a no-op
+            meeting_history_collection.bulk_write([
+                UpdateOne(
+                    {"patient_id": patientid},
+                    {"$pull": {"meeting_details": {"meeting_link": meet_link}}}
+                )
+                for _, patientid, meet_link in rollbacks
+            ], ordered=False)
+        except Exception as e:
+            for index, _, _ in rollbacks:
+                results[index]["history_rollback_error"] = str(e)
+
+    event_ids = [event_id for _, _, _, event_id in unstored]
+    delete_errors = delete_google_meet_events_batch(event_ids, service=service)
+    for (index, _, _, event_id), error in zip(unstored, delete_errors):
+        results[index]["event_id"] = event_id
+        if error:
+            results[index]["status"] = "created_unstored"
+            results[index]["delete_error"] = error
+
+
+@app.post('/api/schedule_meetings_bulk')
+def schedule_meetings_bulk(meetings: List[MeetingRequest], background_tasks: BackgroundTasks):
+    """Schedule many meetings at once and queue emails to the patients
+
+    Declared without async so the blocking Calendar and MongoDB calls run in
+    the threadpool instead of on the event loop.
+    """
+    try:
+        if not meetings:
+            raise HTTPException(status_code=400, detail="No meetings to schedule")
+        if len(meetings) > MAX_BULK_MEETINGS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_MEETINGS} meetings can be scheduled per request")
+
+        results = [
+            {"patientid": m.patientid, "meeting_datetime": m.meeting_datetime, "status": "failed"}
+            for m in meetings
+        ]
+
+        # Fetch all patients in one query
+        patient_ids = list({m.patientid for m in meetings})
+        patients = {
+            p["patientid"]: p
+            for p in collection.find(
+                {"patientid": {"$in": patient_ids}},
+                {"_id": 0, "patientid": 1, "name": 1, "email": 1}
+            )
+        }
+
+        now = datetime.now()
+        pending = []
+        for index, m in enumerate(meetings):
+            patient = patients.get(m.patientid)
+            if not patient:
+                results[index]["error"] = "Patient not found"
+                continue
+            if not patient.get('email'):
+                results[index]["error"] = "Patient email not found in database"
+                continue
+            try:
+                start_dt = datetime.fromisoformat(m.meeting_datetime)
+            except ValueError:
+                results[index]["error"] = "Invalid datetime format. Use: YYYY-MM-DDTHH:MM:SS"
+                continue
+            if start_dt.tzinfo is not None:
+                results[index]["error"] = "Timezone offsets are not supported. Use: YYYY-MM-DDTHH:MM:SS"
+                continue
+            if start_dt <= now:
+                results[index]["error"] = "Meeting datetime must be in the future"
+                continue
+
+            # Store one canonical form so meeting searches compare it correctly
+            start_dt = start_dt.replace(microsecond=0)
+            meeting_datetime = start_dt.isoformat()
+            results[index]["meeting_datetime"] = meeting_datetime
+            end_dt = start_dt + timedelta(hours=1)
+            event = build_meet_event(
+                summary=f"Consultation with {patient['name']}",
+                description="Health Consultation via Google Meet",
+                start_time=meeting_datetime,
+                end_time=end_dt.isoformat()
+            )
+            pending.append((index, patient, meeting_datetime, event))
+
+        if not pending:
+            scheduled = []
+        else:
+            service = get_calendar_service()
+
+            # Create all calendar events through batched requests
+            created = []
+            unstored = []
+            event_results = create_google_meet_events_batch([event for *_, event in pending], service=service)
+            for (index, patient, meeting_datetime, _), (meet_link, event_id, error) in zip(pending, event_results):
+                if error:
+                    results[index]["error"] = f"Failed to create meeting: {error}"
+                    if event_id:
+                        unstored.append((index, patient["patientid"], None, event_id))
+                    continue
+                results[index]["meeting_link"] = meet_link
+                created.append((index, patient, meeting_datetime, meet_link, event_id))
+
+            scheduled_at = datetime.now().isoformat()
+            writes = [
+                (index, patient, {
+                    "meeting_link": meet_link,
+                    "meeting_datetime": meeting_datetime,
+                    "scheduled_at": scheduled_at,
+                    "email_sent": False
+                }, event_id)
+                for index, patient, meeting_datetime, meet_link, event_id in created
+            ]
+
+            # Store meeting history and patient updates in one round trip each
+            scheduled = []
+            try:
+                history_ops = [
+                    UpdateOne(
+                        {"patient_id": patient["patientid"]},
+                        {
+                            "$push": {"meeting_details": meeting_details},
+                            "$setOnInsert": {"patient_email": patient['email']}
+                        },
+                        upsert=True
+                    )
+                    for _, patient, meeting_details, _ in writes
+                ]
+                stored = bulk_write_meetings(meeting_history_collection, history_ops, writes, results)
+
+                patient_ops = [
+                    UpdateOne(
+                        {"patientid": patient["patientid"]},
+                        {"$set": {"meeting_details": meeting_details}}
+                    )
+                    for _, patient, meeting_details, _ in stored
+                ]
+                scheduled = bulk_write_meetings(collection, patient_ops, stored, results)
+            except Exception as e:
+                # The outcome of these writes is unknown, so none of them count as stored
+                for index, *_ in writes:
+                    results[index]["error"] = f"Failed to store meeting: {e}"
+
+            scheduled_indexes = {index for index, *_ in scheduled}
+            unstored += [
+                (index, patient["patientid"], meeting_details["meeting_link"], event_id)
+                for index, patient, meeting_details, event_id in writes
+                if index not in scheduled_indexes
+            ]
+            if unstored:
+                discard_unstored_meetings(service, unstored, results)
+
+        for index, patient, meeting_details, event_id in scheduled:
+            background_tasks.add_task(
+                send_queued_meeting_email,
+                patient["patientid"],
+                patient['name'],
+                patient['email'],
+                meeting_details["meeting_datetime"],
+                meeting_details["meeting_link"]
+            )
+            results[index].update({
+                "status": "success",
+                "patient_name": patient['name'],
+                "patient_email": patient['email'],
+                "event_id": event_id,
+                "email_queued": True
+            })
+
+        scheduled_count = len(scheduled)
+        return JSONResponse(status_code=200, content={
+            "message": f"Scheduled {scheduled_count} of {len(meetings)} meetings",
+            "scheduled": scheduled_count,
+            "failed": len(meetings) - scheduled_count,
+            "results": results
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to schedule meetings: {str(e)}")
+
 # @app.post('/api/schedule_meeting')
 # async def schedule_meeting(patientid: int, meeting_datetime: str):
 #     """Schedule a meeting and send email to patient"""
@@ -320,18 +575,64 @@ async def fetch_all_records():
             raise HTTPException(status_code=404, detail="No records found")
         
         for record in records:
-            if 'time' in record and hasattr(record['time'], 'isoformat'):
-                record['time'] = record['time'].isoformat()
-            if 'meeting_details' in record and isinstance(record['meeting_details'], dict):
-                if 'scheduled_at' in record['meeting_details']:
-                    # Handle both string and datetime objects
-                    scheduled_at = record['meeting_details']['scheduled_at']
-                    if hasattr(scheduled_at, 'isoformat'):
-                        record['meeting_details']['scheduled_at'] = scheduled_at.isoformat()
+            serialize_patient_record(record)
                 
         return JSONResponse(status_code=200, content=records)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+@app.get('/api/search_patients')
+async def search_patients_endpoint(
+    name: str = None,
+    mobileno: str = None,
+    type: str = None,
+    meeting_from: str = None,
+    meeting_to: str = None,
+    upcoming: bool = False,
+    sort_by: str = None,
+    sort_order: str = 'asc',
+    limit: int = 50,
+    cursor: str = None
+):
+    """Search patients by name prefix, mobile number, plan type and meeting window
+
+    Name search is a case-insensitive prefix match on name_lower, which
+    scripts/migrate_patient_search.py backfills. Without sort_by, results are
+    sorted by the filtered field (name, then meeting_datetime, else patientid)
+    so the query stays index-backed. Sorting by name or meeting_datetime only
+    returns patients that have that field, e.g. sort_by=meeting_datetime
+    returns only patients with a meeting.
+    Meeting bounds must be naive datetimes (YYYY-MM-DDTHH:MM:SS).
+    """
+    try:
+        if sort_by is not None and sort_by not in SORT_FIELDS:
+            raise HTTPException(status_code=400, detail=f"sort_by must be one of: {', '.join(SORT_FIELDS)}")
+        if sort_order not in ('asc', 'desc'):
+            raise HTTPException(status_code=400, detail="sort_order must be 'asc' or 'desc'")
+        if limit < 1 or limit > 500:
+            raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+
+        try:
+            if upcoming:
+                now = datetime.now().replace(microsecond=0).isoformat()
+                meeting_from = max(normalize_meeting_bound(meeting_from), now) if meeting_from else now
+            query = build_search_filter(name, mobileno, type, meeting_from, meeting_to)
+            records, next_cursor = search_patients(collection, query, sort_by, sort_order, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        for record in records:
+            serialize_patient_record(record)
+
+        return JSONResponse(status_code=200, content={
+            "records": records,
+            "count": len(records),
+            "next_cursor": next_cursor
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
  
 @app.get('/api/fetch_patient_details')
 async def fetch_patient_details(patientid: int):
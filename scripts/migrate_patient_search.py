@@ -0,0 +1,34 @@
+"""One-off migration for patient search.
+
+Backfills name_lower and creates the search indexes on COLLECTION_NAME. Run it
+once before deploying the search endpoint, and again after bulk imports that do
+not set name_lower; both steps are idempotent. It is kept out of app startup so
+index builds on a large collection do not delay the API from serving.
+
+Usage: python -m scripts.migrate_patient_search
+"""
+import os
+from dotenv import load_dotenv
+from pymongo import MongoClient
+from utils.patient_search import backfill_name_lower, ensure_patient_indexes
+
+load_dotenv()
+
+MONGODB_CONNECTION_STRING = os.getenv("MONGODB_CONNECTION_STRING")
+DATABASE_NAME = os.getenv("DATABASE_NAME")
+COLLECTION_NAME = os.getenv("COLLECTION_NAME")
+
+
+def main():
+    client = MongoClient(MONGODB_CONNECTION_STRING)
+    collection = client[DATABASE_NAME][COLLECTION_NAME]
+
+    updated = backfill_name_lower(collection)
+    print(f"Backfilled name_lower on {updated} patients")
+
+    ensure_patient_indexes(collection)
+    print("Patient search indexes are in place")
+
+
+if __name__ == "__main__":
+    main()
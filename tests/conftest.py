@@ -0,0 +1,136 @@
+import re
+import sys
+import json
+import email
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import httplib2
+import mongomock
+import pymongo
+import pytest
+from googleapiclient.discovery import build
+
+
+@pytest.fixture
+def main_module(monkeypatch):
+    """Import main against a fresh in-memory MongoDB."""
+    monkeypatch.setenv('DATABASE_NAME', 'patient360_test')
+    monkeypatch.setenv('COLLECTION_NAME', 'patients')
+    monkeypatch.setenv('HISTORY_COLLECTION', 'meeting_history')
+    monkeypatch.setattr(pymongo, 'MongoClient', mongomock.MongoClient)
+    sys.modules.pop('main', None)
+    import main
+    yield main
+    sys.modules.pop('main', None)
+
+
+@pytest.fixture
+def client(main_module):
+    from fastapi.testclient import TestClient
+    return TestClient(main_module.app)
+
+
+GOOGLE_ROOT = 'https://www.googleapis.com/'
+
+
+class CalendarBatchHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Calendar /batch/calendar/v3 endpoint."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.posts.append((self.path, body))
+
+        if self.server.fail_batch:
+            data = b'{"error": {"code": 503, "message": "Backend unavailable"}}'
+            self.send_response(503)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        message = email.message_from_bytes(
+            b'Content-Type: ' + self.headers['Content-Type'].encode() + b'\r\n\r\n' + body
+        )
+        boundary = 'batch_response'
+        parts = []
+        for part in message.get_payload():
+            # Each part wraps a full HTTP request: request line, headers, body
+            head, *request_body = re.split(r'\r?\n\r?\n', part.get_payload(), 1)
+            method, path = head.split()[:2]
+            if method == 'DELETE':
+                response = self.delete_event(path.split('?')[0].rsplit('/', 1)[-1])
+            else:
+                response = self.insert_event(json.loads(request_body[0]))
+            content_id = part['Content-ID'][1:-1]
+            parts.append(
+                f'--{boundary}\r\nContent-Type: application/http\r\n'
+                f'Content-ID: <response-{content_id}>\r\n\r\n{response}\r\n'
+            )
+
+        data = (''.join(parts) + f'--{boundary}--\r\n').encode()
+        self.send_response(200)
+        self.send_header('Content-Type', f'multipart/mixed; boundary={boundary}')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def insert_event(self, event):
+        if event['summary'].startswith('FAIL'):
+            return (
+                'HTTP/1.1 400 Bad Request\r\nContent-Type: application/json\r\n\r\n'
+                '{"error": {"code": 400, "message": "Invalid start time"}}'
+            )
+        suffix = event['conferenceData']['createRequest']['requestId'][-8:]
+        created = {'id': f'evt{suffix}'}
+        if 'NOLINK' not in event['summary']:
+            created['hangoutLink'] = f'https://meet.google.com/{suffix}'
+        self.server.inserted.append(created['id'])
+        return 'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n' + json.dumps(created)
+
+    def delete_event(self, event_id):
+        if self.server.fail_delete:
+            return (
+                'HTTP/1.1 500 Internal Server Error\r\nContent-Type: application/json\r\n\r\n'
+                '{"error": {"code": 500, "message": "Delete failed"}}'
+            )
+        self.server.deleted.append(event_id)
+        return 'HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n'
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalHttp(httplib2.Http):
+    """Route requests meant for googleapis.com to the local stand-in."""
+
+    def __init__(self, local_root):
+        super().__init__()
+        self.local_root = local_root
+
+    def request(self, uri, *args, **kwargs):
+        if uri.startswith(GOOGLE_ROOT):
+            uri = self.local_root + uri[len(GOOGLE_ROOT):]
+        return super().request(uri, *args, **kwargs)
+
+
+@pytest.fixture
+def calendar_server():
+    server = HTTPServer(('127.0.0.1', 0), CalendarBatchHandler)
+    server.posts = []
+    server.fail_batch = False
+    server.fail_delete = False
+    server.inserted = []
+    server.deleted = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def calendar_service(calendar_server):
+    local_root = f'http://127.0.0.1:{calendar_server.server_port}/'
+    return build('calendar', 'v3', http=LocalHttp(local_root), static_discovery=True)
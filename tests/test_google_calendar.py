@@ -0,0 +1,86 @@
+from utils.google_calendar import (
+    BATCH_SIZE, build_meet_event, create_google_meet_events_batch, delete_google_meet_events_batch,
+)
+
+
+def make_events(summaries):
+    return [
+        build_meet_event(summary, 'Health Consultation via Google Meet',
+                         '2030-01-01T10:00:00', '2030-01-01T11:00:00')
+        for summary in summaries
+    ]
+
+
+def request_suffix(event):
+    return event['conferenceData']['createRequest']['requestId'][-8:]
+
+
+def test_all_events_created(calendar_server, calendar_service):
+    events = make_events([f'Consultation {i}' for i in range(3)])
+
+    results = create_google_meet_events_batch(events, service=calendar_service)
+
+    assert len(calendar_server.posts) == 1
+    assert calendar_server.posts[0][0] == '/batch/calendar/v3'
+    for event, (meet_link, event_id, error) in zip(events, results):
+        assert error is None
+        assert meet_link == f'https://meet.google.com/{request_suffix(event)}'
+        assert event_id == f'evt{request_suffix(event)}'
+
+
+def test_per_part_error_fails_only_that_event(calendar_server, calendar_service):
+    events = make_events(['Consultation 0', 'FAIL Consultation 1', 'Consultation 2'])
+
+    results = create_google_meet_events_batch(events, service=calendar_service)
+
+    assert results[0][0] is not None and results[0][2] is None
+    assert results[1][:2] == (None, None) and 'Invalid start time' in results[1][2]
+    assert results[2][0] is not None and results[2][2] is None
+
+
+def test_event_without_meet_link_reports_event_id(calendar_server, calendar_service):
+    events = make_events(['NOLINK Consultation'])
+
+    [(meet_link, event_id, error)] = create_google_meet_events_batch(events, service=calendar_service)
+
+    assert meet_link is None
+    assert event_id == f'evt{request_suffix(events[0])}'
+    assert error == 'Event created without a Google Meet link'
+
+
+def test_whole_batch_failure_fails_every_event(calendar_server, calendar_service):
+    calendar_server.fail_batch = True
+    events = make_events([f'Consultation {i}' for i in range(3)])
+
+    results = create_google_meet_events_batch(events, service=calendar_service)
+
+    assert len(results) == len(events)
+    for meet_link, event_id, error in results:
+        assert meet_link is None and event_id is None
+        assert '503' in error
+
+
+def test_events_split_into_batches(calendar_server, calendar_service):
+    events = make_events([f'Consultation {i}' for i in range(BATCH_SIZE + 5)])
+
+    results = create_google_meet_events_batch(events, service=calendar_service)
+
+    assert len(calendar_server.posts) == 2
+    part_counts = [body.count(b'Content-ID') for _, body in calendar_server.posts]
+    assert part_counts == [BATCH_SIZE, 5]
+    assert all(meet_link and error is None for meet_link, _, error in results)
+
+
+def test_delete_events(calendar_server, calendar_service):
+    errors = delete_google_meet_events_batch(['evt1', 'evt2'], service=calendar_service)
+
+    assert errors == [None, None]
+    assert calendar_server.deleted == ['evt1', 'evt2']
+
+
+def test_delete_events_reports_failures(calendar_server, calendar_service):
+    calendar_server.fail_delete = True
+
+    errors = delete_google_meet_events_batch(['evt1'], service=calendar_service)
+
+    assert 'Delete failed' in errors[0]
@@ -0,0 +1,156 @@
+import mongomock
+import pytest
+
+from utils.patient_search import (
+    MEETING_DATETIME_FIELD, backfill_name_lower, build_search_filter, decode_cursor,
+    encode_cursor, ensure_patient_indexes, search_patients,
+)
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock.MongoClient().patient360_test.patients
+    ensure_patient_indexes(collection)
+    return collection
+
+
+def add_patients(collection, count):
+    # Few distinct names and meeting times so many patients share a sort value
+    patients = []
+    for patientid in range(count):
+        name = ['Kavya Iyer', 'kavya Rao', 'Rohan Das'][patientid % 3]
+        patient = {
+            'patientid': patientid,
+            'name': name,
+            'name_lower': name.lower(),
+            'mobileno': f'91{9000000000 + patientid}',
+            'type': 'Diet' if patientid % 2 else 'Exercise',
+        }
+        if patientid % 4:
+            patient['meeting_details'] = {'meeting_datetime': f'2030-01-0{patientid % 3 + 1}T10:00:00'}
+        patients.append(patient)
+    collection.insert_many(patients)
+
+
+def collect_pages(collection, query, **kwargs):
+    records, cursor, pages = [], None, 0
+    while True:
+        page, cursor = search_patients(collection, query, cursor=cursor, **kwargs)
+        records.extend(page)
+        pages += 1
+        if not cursor:
+            return records, pages
+
+
+def test_build_search_filter():
+    query = build_search_filter(name='Kavya', mobileno='919000000001', type='Diet',
+                                meeting_from='2030-01-01 10:00', meeting_to='2030-01-02')
+
+    assert query == {
+        'name_lower': {'$regex': '^kavya'},
+        'mobileno': '919000000001',
+        'type': 'Diet',
+        MEETING_DATETIME_FIELD: {'$gte': '2030-01-01T10:00:00', '$lt': '2030-01-02T00:00:00'},
+    }
+
+
+def test_build_search_filter_escapes_name():
+    query = build_search_filter(name='A.(b)*')
+
+    assert query == {'name_lower': {'$regex': r'^a\.\(b\)\*'}}
+
+
+@pytest.mark.parametrize('bound, message', [
+    ('2030-01-01T10:00:00+05:30', 'Timezone offsets are not supported'),
+    ('tomorrow', 'Invalid datetime format'),
+])
+def test_build_search_filter_rejects_bad_bounds(bound, message):
+    with pytest.raises(ValueError, match=message):
+        build_search_filter(meeting_from=bound)
+    with pytest.raises(ValueError, match=message):
+        build_search_filter(meeting_to=bound)
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor('x', 1)[:-4], 'W10=', ''])
+def test_decode_cursor_rejects_garbage(cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(cursor)
+
+
+def test_decode_cursor_round_trip():
+    assert decode_cursor(encode_cursor('kavya iyer', 42)) == ('kavya iyer', 42)
+
+
+@pytest.mark.parametrize('sort_by', ['patientid', 'name', 'meeting_datetime'])
+@pytest.mark.parametrize('sort_order', ['asc', 'desc'])
+def test_search_pages_without_duplicates_or_gaps(collection, sort_by, sort_order):
+    add_patients(collection, 40)
+    query = build_search_filter(type='Diet')
+
+    records, pages = collect_pages(collection, query, sort_by=sort_by, sort_order=sort_order, limit=3)
+
+    expected = list(collection.find(query))
+    if sort_by == 'meeting_datetime':
+        expected = [p for p in expected if 'meeting_details' in p]
+    ids = [record['patientid'] for record in records]
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == sorted(p['patientid'] for p in expected)
+    assert pages > 1
+
+    field = {'patientid': 'patientid', 'name': 'name_lower', 'meeting_datetime': 'meeting_details'}[sort_by]
+    keys = [(record[field], record['patientid']) if field != 'meeting_details'
+            else (record[field]['meeting_datetime'], record['patientid']) for record in records]
+    assert keys == sorted(keys, reverse=sort_order == 'desc')
+
+
+def test_search_name_is_case_insensitive(collection):
+    add_patients(collection, 9)
+
+    records, _ = collect_pages(collection, build_search_filter(name='KAVYA'), limit=50)
+
+    assert sorted(record['name'] for record in records) == ['Kavya Iyer'] * 3 + ['kavya Rao'] * 3
+
+
+def test_backfill_name_lower(collection):
+    collection.insert_many([
+        {'patientid': 1, 'name': 'Kavya Iyer'},
+        {'patientid': 2, 'name': 'Rohan Das', 'name_lower': 'rohan das'},
+        {'patientid': 3, 'name': 'Meera Nair', 'name_lower': 'stale'},
+        {'patientid': 4},
+    ])
+
+    assert backfill_name_lower(collection) == 2
+    assert backfill_name_lower(collection) == 0
+    names = {p['patientid']: p.get('name_lower') for p in collection.find()}
+    assert names == {1: 'kavya iyer', 2: 'rohan das', 3: 'meera nair', 4: None}
+
+
+@pytest.mark.parametrize('params, detail', [
+    ({'sort_by': 'email'}, 'sort_by must be one of'),
+    ({'sort_order': 'up'}, "sort_order must be 'asc' or 'desc'"),
+    ({'limit': 0}, 'limit must be between 1 and 500'),
+    ({'limit': 501}, 'limit must be between 1 and 500'),
+    ({'meeting_from': 'soon'}, 'Invalid datetime format'),
+    ({'meeting_to': '2030-01-01T10:00:00+05:30'}, 'Timezone offsets are not supported'),
+    ({'upcoming': True, 'meeting_from': 'soon'}, 'Invalid datetime format'),
+    ({'cursor': 'garbage'}, 'Invalid cursor'),
+])
+def test_search_endpoint_bad_requests(client, params, detail):
+    response = client.get('/api/search_patients', params=params)
+
+    assert response.status_code == 400
+    assert detail in response.json()['detail']
+
+
+def test_search_endpoint_upcoming_uses_later_bound(client, main_module):
+    main_module.collection.insert_many([
+        {'patientid': 1, 'name': 'Past', 'meeting_details': {'meeting_datetime': '2000-01-01T10:00:00'}},
+        {'patientid': 2, 'name': 'Soon', 'meeting_details': {'meeting_datetime': '2090-01-01T10:00:00'}},
+        {'patientid': 3, 'name': 'Later', 'meeting_details': {'meeting_datetime': '2095-01-01T10:00:00'}},
+    ])
+
+    response = client.get('/api/search_patients', params={'upcoming': True})
+    assert [r['patientid'] for r in response.json()['records']] == [2, 3]
+
+    response = client.get('/api/search_patients', params={'upcoming': True, 'meeting_from': '2091-01-01'})
+    assert [r['patientid'] for r in response.json()['records']] == [3]
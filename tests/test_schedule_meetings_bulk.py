@@ -0,0 +1,186 @@
+import pytest
+from pymongo.errors import BulkWriteError
+
+
+@pytest.fixture
+def bulk(main_module, client, calendar_server, calendar_service, monkeypatch):
+    """Endpoint wired to mongomock, the local Calendar stand-in and a fake mailer."""
+    sent = []
+    monkeypatch.setattr(main_module, 'get_calendar_service', lambda: calendar_service)
+    monkeypatch.setattr(main_module, 'send_meeting_email', lambda *args: sent.append(args) or True)
+    main_module.collection.insert_many([
+        {'patientid': 1, 'name': 'Kavya Iyer', 'email': 'kavya@example.com', 'Diet_PLAN': {'DAY1': 'Oats'}},
+        {'patientid': 2, 'name': 'Rohan Das', 'email': 'rohan@example.com'},
+        {'patientid': 3, 'name': 'Meera Nair', 'email': 'meera@example.com'},
+        {'patientid': 4, 'name': 'Arjun Rao'},
+        {'patientid': 5, 'name': 'NOLINK Patient', 'email': 'nolink@example.com'},
+    ])
+
+    def post(items):
+        return client.post('/api/schedule_meetings_bulk', json=[
+            {'patientid': patientid, 'meeting_datetime': meeting_datetime}
+            for patientid, meeting_datetime in items
+        ])
+
+    post.sent = sent
+    post.main = main_module
+    post.calendar = calendar_server
+    return post
+
+
+def fail_first_bulk_write(monkeypatch, target, positions=(), error=None):
+    """Make target's next bulk_write fail the ops at `positions` (or raise `error`)."""
+    real_bulk_write = target.bulk_write
+    calls = []
+
+    def bulk_write(ops, ordered=True):
+        calls.append(ops)
+        if len(calls) > 1:
+            return real_bulk_write(ops, ordered=ordered)
+        if error is not None:
+            raise error
+        kept = [op for position, op in enumerate(ops) if position not in positions]
+        if kept:
+            real_bulk_write(kept, ordered=ordered)
+        raise BulkWriteError({'writeErrors': [
+            {'index': position, 'errmsg': 'write conflict'} for position in positions
+        ]})
+
+    monkeypatch.setattr(target, 'bulk_write', bulk_write)
+
+
+def history_links(main_module, patientid):
+    history = main_module.meeting_history_collection.find_one({'patient_id': patientid}) or {}
+    return [meeting['meeting_link'] for meeting in history.get('meeting_details', [])]
+
+
+def test_schedules_and_normalizes_datetimes(bulk):
+    response = bulk([(1, '2090-01-01 10:00'), (2, '2090-01-02'), (3, '2090-01-03T09:30:00.123456')])
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body['scheduled'] == 3 and body['failed'] == 0
+    assert [r['meeting_datetime'] for r in body['results']] == [
+        '2090-01-01T10:00:00', '2090-01-02T00:00:00', '2090-01-03T09:30:00'
+    ]
+    assert len(bulk.calendar.posts) == 1
+
+    patient = bulk.main.collection.find_one({'patientid': 1})
+    assert patient['meeting_details']['meeting_datetime'] == '2090-01-01T10:00:00'
+    assert patient['meeting_details']['meeting_link'] == body['results'][0]['meeting_link']
+    # Emails are sent after the response and flip email_sent on both records
+    assert patient['meeting_details']['email_sent'] is True
+    history = bulk.main.meeting_history_collection.find_one({'patient_id': 1})
+    assert history['patient_email'] == 'kavya@example.com'
+    assert history['meeting_details'][0]['email_sent'] is True
+    assert [args[2] for args in bulk.sent] == [
+        '2090-01-01T10:00:00', '2090-01-02T00:00:00', '2090-01-03T09:30:00'
+    ]
+
+
+def test_invalid_items_fail_individually(bulk):
+    response = bulk([
+        (1, '2090-01-01T10:00:00'),
+        (99, '2090-01-01T10:00:00'),
+        (4, '2090-01-01T10:00:00'),
+        (2, '2090-01-01T10:00:00+05:30'),
+        (2, '2000-01-01T10:00:00'),
+        (3, 'next tuesday'),
+    ])
+
+    results = response.json()['results']
+    assert response.status_code == 200
+    assert [r['status'] for r in results] == ['success'] + ['failed'] * 5
+    assert [r.get('error') for r in results[1:]] == [
+        'Patient not found',
+        'Patient email not found in database',
+        'Timezone offsets are not supported. Use: YYYY-MM-DDTHH:MM:SS',
+        'Meeting datetime must be in the future',
+        'Invalid datetime format. Use: YYYY-MM-DDTHH:MM:SS',
+    ]
+    assert len(bulk.calendar.inserted) == 1
+    assert len(bulk.sent) == 1
+
+
+def test_duplicate_patient_gets_every_meeting(bulk):
+    response = bulk([(1, '2090-01-01T10:00:00'), (1, '2090-01-02T10:00:00')])
+
+    results = response.json()['results']
+    assert [r['status'] for r in results] == ['success', 'success']
+    assert history_links(bulk.main, 1) == [r['meeting_link'] for r in results]
+    assert len(bulk.sent) == 2
+
+
+def test_history_write_error_maps_to_item(bulk, monkeypatch):
+    fail_first_bulk_write(monkeypatch, bulk.main.meeting_history_collection, positions={1})
+
+    response = bulk([(1, '2090-01-01T10:00:00'), (2, '2090-01-01T11:00:00'), (3, '2090-01-01T12:00:00')])
+
+    results = response.json()['results']
+    assert [r['status'] for r in results] == ['success', 'failed', 'success']
+    assert results[1]['error'] == 'Failed to store meeting: write conflict'
+    # The failed item is skipped in the patient update and its event is deleted
+    assert 'meeting_details' not in bulk.main.collection.find_one({'patientid': 2})
+    assert bulk.calendar.deleted == [results[1]['event_id']]
+    assert [args[1] for args in bulk.sent] == ['kavya@example.com', 'meera@example.com']
+
+
+def test_patient_write_error_rolls_back_history(bulk, monkeypatch):
+    fail_first_bulk_write(monkeypatch, bulk.main.collection, positions={0})
+
+    response = bulk([(1, '2090-01-01T10:00:00'), (2, '2090-01-01T11:00:00')])
+
+    results = response.json()['results']
+    assert [r['status'] for r in results] == ['failed', 'success']
+    assert history_links(bulk.main, 1) == []
+    assert history_links(bulk.main, 2) == [results[1]['meeting_link']]
+    assert bulk.calendar.deleted == [results[0]['event_id']]
+    assert [args[1] for args in bulk.sent] == ['rohan@example.com']
+
+
+def test_unexpected_write_error_cleans_up_every_event(bulk, monkeypatch):
+    fail_first_bulk_write(monkeypatch, bulk.main.meeting_history_collection, error=RuntimeError('connection reset'))
+
+    response = bulk([(1, '2090-01-01T10:00:00'), (2, '2090-01-01T11:00:00')])
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body['scheduled'] == 0
+    assert all(r['error'] == 'Failed to store meeting: connection reset' for r in body['results'])
+    assert sorted(bulk.calendar.deleted) == sorted(bulk.calendar.inserted)
+    assert bulk.sent == []
+
+
+def test_event_without_meet_link_is_deleted(bulk):
+    response = bulk([(5, '2090-01-01T10:00:00'), (1, '2090-01-01T11:00:00')])
+
+    results = response.json()['results']
+    assert results[0]['status'] == 'failed'
+    assert results[0]['error'] == 'Failed to create meeting: Event created without a Google Meet link'
+    assert bulk.calendar.deleted == [results[0]['event_id']]
+    assert history_links(bulk.main, 5) == []
+
+
+def test_undeletable_event_is_reported_created_unstored(bulk, monkeypatch):
+    bulk.calendar.fail_delete = True
+    fail_first_bulk_write(monkeypatch, bulk.main.meeting_history_collection, positions={0})
+
+    response = bulk([(1, '2090-01-01T10:00:00')])
+
+    [result] = response.json()['results']
+    assert result['status'] == 'created_unstored'
+    assert result['event_id'] in bulk.calendar.inserted
+    assert 'Delete failed' in result['delete_error']
+    assert bulk.sent == []
+
+
+@pytest.mark.parametrize('count, detail', [
+    (0, 'No meetings to schedule'),
+    (201, 'At most 200 meetings can be scheduled per request'),
+])
+def test_rejects_empty_and_oversized_requests(bulk, count, detail):
+    response = bulk([(1, '2090-01-01T10:00:00')] * count)
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == detail
+    assert bulk.calendar.posts == []
@@ -1,5 +1,5 @@
 import os
-import datetime
+import uuid
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
@@ -26,11 +26,13 @@ def get_calendar_service():
     return service
 
 
-def create_google_meet_event(summary, description, start_time, end_time, timezone='Asia/Kolkata'):
-    """Create a Google Calendar event with a Google Meet link."""
-    service = get_calendar_service()
+# Google recommends at most 50 calls per Calendar batch request
+BATCH_SIZE = 50
+
 
-    event = {
+def build_meet_event(summary, description, start_time, end_time, timezone='Asia/Kolkata'):
+    """Build the event body for a Google Calendar event with a Google Meet link."""
+    return {
         'summary': summary,
         'description': description,
         'start': {
@@ -43,7 +45,8 @@ def create_google_meet_event(summary, description, start_time, end_time, timezon
         },
         'conferenceData': {
             'createRequest': {
-                'requestId': f"meet-{datetime.datetime.utcnow().timestamp()}",
+                # Must be unique per event, including events created in the same batch
+                'requestId': f"meet-{uuid.uuid4().hex}",
                 'conferenceSolutionKey': {
                     'type': 'hangoutsMeet'
                 }
@@ -51,6 +54,13 @@ def create_google_meet_event(summary, description, start_time, end_time, timezon
         }
     }
 
+
+def create_google_meet_event(summary, description, start_time, end_time, timezone='Asia/Kolkata'):
+    """Create a Google Calendar event with a Google Meet link."""
+    service = get_calendar_service()
+
+    event = build_meet_event(summary, description, start_time, end_time, timezone)
+
     event_result = service.events().insert(
         calendarId='primary',
         body=event,
@@ -58,3 +68,76 @@ def create_google_meet_event(summary, description, start_time, end_time, timezon
     ).execute()
 
     return event_result.get('hangoutLink')
+
+
+def execute_in_batches(service, requests):
+    """Run Calendar API requests through batch calls, BATCH_SIZE at a time.
+
+    Returns a list of (response, error) tuples in the same order as `requests`,
+    where exactly one is None.
+    """
+    responses = [None] * len(requests)
+
+    def callback(request_id, response, exception):
+        if exception is not None:
+            responses[int(request_id)] = (None, str(exception))
+        else:
+            responses[int(request_id)] = (response, None)
+
+    for start in range(0, len(requests), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=callback)
+        for index in range(start, min(start + BATCH_SIZE, len(requests))):
+            batch.add(requests[index], request_id=str(index))
+        try:
+            batch.execute()
+        except Exception as e:
+            # The whole batch failed; mark every call in it that got no response
+            for index in range(start, min(start + BATCH_SIZE, len(requests))):
+                if responses[index] is None:
+                    responses[index] = (None, str(e))
+
+    # Guarantee every slot is filled, even if a part got no callback
+    for index, response in enumerate(responses):
+        if response is None:
+            responses[index] = (None, "No response in batch")
+
+    return responses
+
+
+def create_google_meet_events_batch(events, service=None):
+    """Create many Google Meet events through Calendar batch requests.
+
+    `events` is a list of event bodies from build_meet_event. Returns a list of
+    (meet_link, event_id, error) tuples in the same order. event_id is set
+    whenever the event exists, including when it was created without a Meet
+    link and so is reported as an error.
+    """
+    if service is None:
+        service = get_calendar_service()
+
+    requests = [
+        service.events().insert(calendarId='primary', body=event, conferenceDataVersion=1)
+        for event in events
+    ]
+
+    results = []
+    for response, error in execute_in_batches(service, requests):
+        if error:
+            results.append((None, None, error))
+        elif not response.get('hangoutLink'):
+            results.append((None, response.get('id'), "Event created without a Google Meet link"))
+        else:
+            results.append((response['hangoutLink'], response.get('id'), None))
+    return results
+
+
+def delete_google_meet_events_batch(event_ids, service=None):
+    """Delete Calendar events through batch requests; returns an error or None per id."""
+    if service is None:
+        service = get_calendar_service()
+
+    requests = [
+        service.events().delete(calendarId='primary', eventId=event_id)
+        for event_id in event_ids
+    ]
+    return [error for _, error in execute_in_batches(service, requests)]
@@ -0,0 +1,192 @@
+import re
+import json
+import base64
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+MEETING_DATETIME_FIELD = 'meeting_details.meeting_datetime'
+
+# Lowercased copy of name, so name search and sort are case-insensitive and
+# index-backed. Anything that writes a patient's name must also set
+# name_lower = name.lower(); backfill_name_lower fixes up existing records.
+NAME_LOWER_FIELD = 'name_lower'
+BACKFILL_BATCH_SIZE = 1000
+
+# Fields the search endpoint is allowed to sort on, mapped to their document path
+SORT_FIELDS = {
+    'patientid': 'patientid',
+    'name': NAME_LOWER_FIELD,
+    'meeting_datetime': MEETING_DATETIME_FIELD,
+}
+
+# Indexes follow equality -> sort -> range order so the common searches are served
+# without an in-memory sort, with patientid last as the pagination tie-breaker:
+#   - patientid sort, optionally with exact mobileno or type
+#   - name prefix sorted by name_lower, optionally with exact type
+#   - meeting range sorted by meeting_datetime, optionally with exact type
+# Not index-backed (MongoDB filters or sorts the matching range in memory):
+#   - name prefix and meeting range together (only one range can bound the scan)
+#   - a name or meeting filter with an explicit sort on a different field, e.g.
+#     sort_by=patientid with a name prefix
+#   - mobileno combined with a sort other than patientid
+PATIENT_INDEXES = [
+    [('patientid', ASCENDING)],
+    [(NAME_LOWER_FIELD, ASCENDING), ('patientid', ASCENDING)],
+    [('mobileno', ASCENDING), ('patientid', ASCENDING)],
+    [('type', ASCENDING), ('patientid', ASCENDING)],
+    [('type', ASCENDING), (NAME_LOWER_FIELD, ASCENDING), ('patientid', ASCENDING)],
+    [(MEETING_DATETIME_FIELD, ASCENDING), ('patientid', ASCENDING)],
+    [('type', ASCENDING), (MEETING_DATETIME_FIELD, ASCENDING), ('patientid', ASCENDING)],
+]
+
+
+def ensure_patient_indexes(collection):
+    """Create the indexes backing patient search (no-op if they already exist)."""
+    for keys in PATIENT_INDEXES:
+        collection.create_index(keys)
+
+
+def backfill_name_lower(collection):
+    """Set name_lower on every patient where it is missing or stale; returns the count."""
+    updated = 0
+    ops = []
+    for patient in collection.find({'name': {'$type': 'string'}}, {'name': 1, NAME_LOWER_FIELD: 1}):
+        name_lower = patient['name'].lower()
+        if patient.get(NAME_LOWER_FIELD) == name_lower:
+            continue
+        ops.append(UpdateOne({'_id': patient['_id']}, {'$set': {NAME_LOWER_FIELD: name_lower}}))
+        if len(ops) == BACKFILL_BATCH_SIZE:
+            collection.bulk_write(ops, ordered=False)
+            updated += len(ops)
+            ops = []
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+        updated += len(ops)
+    return updated
+
+
+def encode_cursor(sort_value, patientid):
+    """Encode the last returned (sort value, patientid) pair as an opaque cursor."""
+    raw = json.dumps([sort_value, patientid]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed."""
+    try:
+        sort_value, patientid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return sort_value, patientid
+
+
+def normalize_meeting_bound(value):
+    """Normalize a meeting datetime bound to the naive YYYY-MM-DDTHH:MM:SS form.
+
+    Raises ValueError for malformed or timezone-aware values, since those cannot
+    be compared against the stored naive strings.
+    """
+    try:
+        bound = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError("Invalid datetime format. Use: YYYY-MM-DDTHH:MM:SS")
+    if bound.tzinfo is not None:
+        raise ValueError("Timezone offsets are not supported. Use: YYYY-MM-DDTHH:MM:SS")
+    return bound.isoformat()
+
+
+def build_search_filter(name=None, mobileno=None, type=None, meeting_from=None, meeting_to=None):
+    """Build the MongoDB filter for the given search criteria.
+
+    Name is matched case-insensitively as an anchored prefix of name_lower, so
+    MongoDB can serve it from the name_lower index. Meeting bounds are normalized and compared as strings
+    against meeting_datetime, so the range is only correct for stored values in
+    the naive YYYY-MM-DDTHH:MM:SS form.
+    """
+    query = {}
+    if name:
+        query[NAME_LOWER_FIELD] = {'$regex': f"^{re.escape(name.lower())}"}
+    if mobileno:
+        query['mobileno'] = mobileno
+    if type:
+        query['type'] = type
+
+    meeting_range = {}
+    if meeting_from:
+        meeting_range['$gte'] = normalize_meeting_bound(meeting_from)
+    if meeting_to:
+        meeting_range['$lt'] = normalize_meeting_bound(meeting_to)
+    if meeting_range:
+        query[MEETING_DATETIME_FIELD] = meeting_range
+
+    return query
+
+
+def default_sort_by(query):
+    """Pick the sort that lets the filtered range be served from its index."""
+    if NAME_LOWER_FIELD in query:
+        return 'name'
+    if MEETING_DATETIME_FIELD in query:
+        return 'meeting_datetime'
+    return 'patientid'
+
+
+def search_patients(collection, query, sort_by=None, sort_order='asc', limit=50, cursor=None):
+    """Run a keyset-paginated search and return (records, next_cursor).
+
+    When sort_by is None it defaults to the filtered field (see default_sort_by).
+    Sorting by name or meeting_datetime excludes patients without that field
+    (name_lower for name).
+    """
+    if sort_by is None:
+        sort_by = default_sort_by(query)
+    sort_field = SORT_FIELDS[sort_by]
+    direction = ASCENDING if sort_order == 'asc' else DESCENDING
+    op = '$gt' if direction == ASCENDING else '$lt'
+
+    conditions = [query] if query else []
+    if sort_field != 'patientid':
+        # Patients without the sort field cannot be ordered or paged past reliably
+        conditions.append({sort_field: {'$ne': None}})
+
+    if cursor:
+        last_value, last_patientid = decode_cursor(cursor)
+        if sort_field == 'patientid':
+            conditions.append({'patientid': {op: last_patientid}})
+        else:
+            conditions.append({'$or': [
+                {sort_field: {op: last_value}},
+                {sort_field: last_value, 'patientid': {op: last_patientid}},
+            ]})
+
+    if not conditions:
+        mongo_filter = {}
+    elif len(conditions) == 1:
+        mongo_filter = conditions[0]
+    else:
+        mongo_filter = {'$and': conditions}
+
+    sort_spec = [(sort_field, direction)]
+    if sort_field != 'patientid':
+        sort_spec.append(('patientid', direction))
+
+    # Fetch one extra record to know whether another page exists
+    records = list(
+        collection.find(mongo_filter, {'_id': 0})
+        .sort(sort_spec)
+        .limit(limit + 1)
+    )
+
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        last = records[-1]
+        if sort_field == 'patientid':
+            last_value = last['patientid']
+        else:
+            last_value = last
+            for part in sort_field.split('.'):
+                last_value = last_value[part]
+        next_cursor = encode_cursor(last_value, last['patientid'])
+
+    return records, next_cursor